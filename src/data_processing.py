@@ -15,10 +15,22 @@ IMPORTANT NOTES:
 - Aim for production-quality code, not just passing tests
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import os
 from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+try:
+    import bottleneck
+except ImportError:  # bottleneck is an optional accelerator
+    bottleneck = None
+
+
+# Anomaly detection methods supported by detect_anomalies()
+_ANOMALY_METHODS = ["zscore", "iqr", "rolling"]
+
 
 def ingest_data(
     data_batches: List[pd.DataFrame],
@@ -79,8 +91,14 @@ def ingest_data(
     if not valid_batches:
         raise ValueError("All data batches are empty")
     
-    # Concatenate all batches
-    consolidated = pd.concat(valid_batches, ignore_index=True)
+    # Concatenate all batches. A single batch needs no concatenation: a shallow
+    # copy shares its columns, and later column assignments only replace them in
+    # the copy, so the caller's frame is never modified. Its index is replaced by
+    # the final chronological sort.
+    if len(valid_batches) == 1:
+        consolidated = valid_batches[0].copy(deep=False)
+    else:
+        consolidated = pd.concat(valid_batches, ignore_index=True)
     
     # Validate required columns
     required_columns = ["timestamp", "sensor", "value", "unit", "quality"]
@@ -88,16 +106,30 @@ def ingest_data(
     if missing_columns:
         raise ValueError(f"Missing required columns: {missing_columns}")
     
+    # Store the low-cardinality string columns as categoricals so that comparisons,
+    # sorting and grouping downstream operate on small integer codes instead of
+    # Python string objects
+    for col in ("sensor", "unit", "quality"):
+        consolidated[col] = consolidated[col].astype("category")
+    
+    # Sensor readings do not need float64 range/precision; float32 halves the bytes
+    # moved by every downstream pass. Reductions upcast to float64 where they run.
+    consolidated["value"] = consolidated["value"].astype(np.float32)
+    
     if validate:
-        # Remove exact duplicates (all columns match)
-        consolidated = consolidated.drop_duplicates()
-        
         # Remove duplicates based on timestamp + sensor (keep first occurrence)
-        # This handles cases where the same sensor reading at same time appears multiple times
-        consolidated = consolidated.drop_duplicates(subset=["timestamp", "sensor"], keep="first")
-        
+        # This handles cases where the same sensor reading at same time appears multiple times.
+        # Exact duplicates (all columns match) are a subset of these, so a separate
+        # full-row pass would only re-hash every column for no benefit.
+        # Only the two key columns are hashed (sensor via its integer codes), and the
+        # hash table compares keys exactly, so colliding hashes never drop a reading.
+        # This avoids reordering the whole frame by (sensor, timestamp) just to make
+        # duplicates adjacent.
+        is_duplicate = consolidated.duplicated(["timestamp", "sensor"], keep="first")
+        consolidated = consolidated[~is_duplicate.to_numpy()]
+
         # Sort by timestamp for chronological order
-        consolidated = consolidated.sort_values("timestamp").reset_index(drop=True)
+        consolidated = _sort_by_timestamp(consolidated)
         
         # Optional: Filter out BAD quality readings (keeping GOOD and UNCERTAIN)
         # Note: Keeping UNCERTAIN as they may still have value
@@ -108,7 +140,7 @@ def ingest_data(
         
     else:
         # Even without validation, sort by timestamp for consistency
-        consolidated = consolidated.sort_values("timestamp").reset_index(drop=True)
+        consolidated = _sort_by_timestamp(consolidated)
     
     return consolidated
 
@@ -160,114 +192,151 @@ def detect_anomalies(
     - Think about edge cases: what if all data is anomalous? None is?
     - Document your approach and limitations in NOTES.md
     """
-    # Validate that the sensor exists in the data
-    if sensor_name not in data["sensor"].values:
+    # Validate that the sensor exists in the data. Comparing the column against the
+    # name works on categorical codes, so selecting the sensor's row positions is a
+    # single linear pass; unused categories yield no rows and count as not found.
+    sensor_rows = np.flatnonzero((data["sensor"] == sensor_name).to_numpy())
+    if len(sensor_rows) == 0:
         raise ValueError(f"Sensor '{sensor_name}' not found in data")
     
     # Validate the method
-    supported_methods = ["zscore", "iqr", "rolling"]
-    if method not in supported_methods:
-        raise ValueError(f"Method '{method}' not supported. Choose from: {supported_methods}")
+    if method not in _ANOMALY_METHODS:
+        raise ValueError(f"Method '{method}' not supported. Choose from: {_ANOMALY_METHODS}")
+    
+    # Score the sensor's readings as a contiguous float64 array rather than an
+    # indexed Series
+    values = data["value"].to_numpy(dtype=np.float64)[sensor_rows]
+    sensor_scores, sensor_flags = _score_sensor_values(values, sensor_name, method, threshold)
+    
+    # With copy-on-write (always on in pandas >= 3) a shallow copy shares the existing
+    # columns with the input and only the three anomaly columns are newly allocated;
+    # without it, writes to the result could reach the caller's frame, so copy deeply.
+    result = data.copy(deep=not _copy_on_write_enabled())
+    
+    # Compute into whole-column arrays with compact dtypes (bool flags, float32
+    # scores); rows of other sensors keep the zero / False defaults. Results are
+    # scattered through the sensor's row positions, so each assignment touches
+    # only that sensor's entries.
+    scores = np.zeros(len(result), dtype=np.float32)
+    flags = np.zeros(len(result), dtype=bool)
+    scores[sensor_rows] = sensor_scores
+    flags[sensor_rows] = sensor_flags
+    
+    # Replace whole columns in one shot; the method label is categorical
+    # rather than a Python-object column
+    method_categories = [""] + _ANOMALY_METHODS
+    method_codes = np.zeros(len(result), dtype=np.int8)
+    method_codes[sensor_rows] = method_categories.index(method)
+    result["is_anomaly"] = flags
+    result["anomaly_score"] = scores
+    result["detection_method"] = pd.Categorical.from_codes(
+        method_codes, categories=method_categories
+    )
     
-    # Make a copy to avoid modifying the original data
-    result = data.copy()
+    return result
+
+
+def detect_anomalies_all(
+    data: pd.DataFrame,
+    method: str = "zscore",
+    threshold: float = 3.0,
+    max_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Detect anomalies for every sensor in the data at once.
     
-    # Filter data for the specific sensor
-    sensor_mask = result["sensor"] == sensor_name
-    sensor_data = result.loc[sensor_mask, "value"].copy()
+    Batch counterpart of detect_anomalies() for callers analyzing all sensors.
+    For "zscore" the per-sensor mean and std come from a single grouped pass over
+    the value column instead of one pass (and one frame copy) per sensor.
     
-    # Check if we have sufficient valid data
-    valid_data = sensor_data.dropna()
-    if len(valid_data) < 2:
-        raise ValueError(f"Insufficient data for sensor '{sensor_name}'. Need at least 2 valid readings.")
+    Args:
+        data: DataFrame from ingest_data() containing sensor readings
+        method: Detection method - "zscore", "iqr", or "rolling" (see detect_anomalies)
+        threshold: Sensitivity parameter (interpretation depends on method)
+        max_workers: Number of threads scoring sensors in parallel for "iqr" and
+            "rolling" (None uses os.cpu_count())
     
-    # Initialize anomaly columns for all rows
-    result["is_anomaly"] = False
-    result["anomaly_score"] = 0.0
-    result["detection_method"] = ""
+    Returns:
+        DataFrame with original data plus is_anomaly, anomaly_score and
+        detection_method columns, filled in for every sensor. Sensors with
+        insufficient data for the method are left unscored (empty detection_method).
     
-    # Apply the selected detection method
-    if method == "zscore":
-        # Z-score method: Flag values beyond threshold standard deviations from mean
-        mean = valid_data.mean()
-        std = valid_data.std()
-        
-        # Handle case where std is 0 (all values are the same)
-        if std == 0:
-            # No variance means no anomalies
-            anomaly_scores = pd.Series(0.0, index=sensor_data.index)
-        else:
-            # Calculate z-scores for all sensor readings
-            z_scores = np.abs((sensor_data - mean) / std)
-            anomaly_scores = z_scores
-            
-            # Flag anomalies where |z-score| > threshold
-            is_anomaly = z_scores > threshold
-            result.loc[sensor_mask, "is_anomaly"] = is_anomaly.fillna(False)
-        
-        result.loc[sensor_mask, "anomaly_score"] = anomaly_scores.fillna(0.0)
+    Raises:
+        ValueError: If data is empty or method not supported
     
-    elif method == "iqr":
-        # IQR method: Flag values beyond threshold * IQR from quartiles
-        q1 = valid_data.quantile(0.25)
-        q3 = valid_data.quantile(0.75)
-        iqr = q3 - q1
-        
-        # Handle case where IQR is 0
-        if iqr == 0:
-            # No variance in middle 50% means we use a simpler check
-            anomaly_scores = pd.Series(0.0, index=sensor_data.index)
-        else:
-            # Calculate bounds
-            lower_bound = q1 - threshold * iqr
-            upper_bound = q3 + threshold * iqr
-            
-            # Calculate how far outside the bounds each value is
-            below_lower = np.maximum(0, lower_bound - sensor_data)
-            above_upper = np.maximum(0, sensor_data - upper_bound)
-            
-            # Anomaly score is the distance outside bounds, normalized by IQR
-            anomaly_scores = (below_lower + above_upper) / iqr if iqr > 0 else pd.Series(0.0, index=sensor_data.index)
-            
-            # Flag as anomaly if outside bounds
-            is_anomaly = (sensor_data < lower_bound) | (sensor_data > upper_bound)
-            result.loc[sensor_mask, "is_anomaly"] = is_anomaly.fillna(False)
-        
-        result.loc[sensor_mask, "anomaly_score"] = anomaly_scores.fillna(0.0)
+    Example:
+        >>> anomalies = detect_anomalies_all(clean_data, method="zscore", threshold=3.0)
+        >>> print(anomalies.groupby("sensor", observed=True)["is_anomaly"].sum())
+    """
+    if data is None or data.empty:
+        raise ValueError("Data cannot be empty")
     
-    elif method == "rolling":
-        # Rolling method: Flag based on rolling window statistics
-        # Use a window size based on data length (at least 5, max 20)
-        window_size = min(max(5, len(valid_data) // 10), 20)
-        
-        if len(valid_data) < window_size:
-            raise ValueError(f"Insufficient data for rolling method. Need at least {window_size} valid readings.")
-        
-        # Sort by timestamp for proper rolling window calculation
-        sensor_indices = result[sensor_mask].index
-        sensor_subset = result.loc[sensor_mask].copy()
+    if method not in _ANOMALY_METHODS:
+        raise ValueError(f"Method '{method}' not supported. Choose from: {_ANOMALY_METHODS}")
+    
+    method_categories = [""] + _ANOMALY_METHODS
+    scores = np.zeros(len(data))
+    flags = np.zeros(len(data), dtype=bool)
+    scored = np.zeros(len(data), dtype=bool)
+    
+    if method == "zscore":
+        # One grouped pass computes every sensor's mean and std (ddof=1)
+        values = data["value"].to_numpy(dtype=np.float64)
+        grouped = pd.Series(values, index=data.index).groupby(
+            data["sensor"], sort=False, observed=True
+        )
+        means = grouped.transform("mean").to_numpy(dtype=np.float64)
+        stds = grouped.transform("std").to_numpy(dtype=np.float64)
+        valid_counts = grouped.transform("count").to_numpy()
         
-        # Calculate rolling mean and std
-        rolling_mean = sensor_subset["value"].rolling(window=window_size, center=True, min_periods=1).mean()
-        rolling_std = sensor_subset["value"].rolling(window=window_size, center=True, min_periods=1).std()
+        # Sensors with fewer than 2 valid readings are not scored; zero std means no anomalies
+        scored = valid_counts >= 2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            z_scores = np.abs((values - means) / stds)
+        z_scores = np.where(scored & (stds > 0) & ~np.isnan(z_scores), z_scores, 0.0)
+        scores = z_scores
+        flags = z_scores > threshold
+    else:
+        # Methods without a grouped formulation run per sensor. The sensor index and
+        # the value array are built once; each sensor is scored on its own slice.
+        sensor_index = _build_sensor_index(data["sensor"])
+        names = sensor_index[0]
+        values = data["value"].to_numpy(dtype=np.float64)
         
-        # Handle cases where rolling_std is 0 or NaN
-        rolling_std = rolling_std.fillna(valid_data.std())
-        rolling_std = rolling_std.replace(0, valid_data.std() if valid_data.std() > 0 else 1.0)
+        def score_sensor(sensor_name):
+            rows = _sensor_rows(sensor_index, sensor_name)
+            try:
+                sensor_scores, sensor_flags = _score_sensor_values(
+                    values[rows], sensor_name, method, threshold
+                )
+            except ValueError:
+                # Insufficient data for this sensor - leave it unscored
+                return rows, None, None
+            return rows, sensor_scores, sensor_flags
         
-        # Calculate deviation from rolling statistics
-        deviations = np.abs((sensor_subset["value"] - rolling_mean) / rolling_std)
-        anomaly_scores = deviations
+        # Sensors are independent and the heavy lifting is in NumPy, which releases
+        # the GIL, so they are scored concurrently on a thread pool. A single sensor
+        # or worker gains nothing from the pool and runs inline.
+        workers = min(max_workers or os.cpu_count() or 1, len(names))
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                sensor_results = list(executor.map(score_sensor, names))
+        else:
+            sensor_results = [score_sensor(sensor_name) for sensor_name in names]
         
-        # Flag anomalies
-        is_anomaly = deviations > threshold
-        result.loc[sensor_mask, "is_anomaly"] = is_anomaly.fillna(False)
-        result.loc[sensor_mask, "anomaly_score"] = anomaly_scores.fillna(0.0)
-    
-    # Set detection method for the sensor rows
-    result.loc[sensor_mask, "detection_method"] = method
-    
-    return result
+        for rows, sensor_scores, sensor_flags in sensor_results:
+            if sensor_scores is None:
+                continue
+            scores[rows] = sensor_scores
+            flags[rows] = sensor_flags
+            scored[rows] = True
+    
+    method_codes = np.where(scored, method_categories.index(method), 0).astype(np.int8)
+    return data.assign(
+        is_anomaly=flags,
+        anomaly_score=scores.astype(np.float32),
+        detection_method=pd.Categorical.from_codes(method_codes, categories=method_categories),
+    )
 
 
 def summarize_metrics(
@@ -345,105 +414,553 @@ def summarize_metrics(
         if "timestamp" not in data.columns:
             raise ValueError("Data must contain 'timestamp' column for time-based aggregation")
         
-        # Set timestamp as index for resampling
-        data_copy = data.copy()
-        data_copy = data_copy.set_index("timestamp")
+        # Assign rows to time bins with a binary search over precomputed bin edges
+        time_bins = _time_bins(data["timestamp"], time_window)
+        if time_bins is None:
+            # Calendar-based frequencies (months, weeks, ...) have irregular bins:
+            # fall back to pandas' resampling grouper
+            return _summarize_with_grouper(data, group_by, time_window, has_anomaly_data)
+        edges, bin_ids = time_bins
         
-        # Group by time_window and group_by column
-        if group_by:
-            grouped = data_copy.groupby([pd.Grouper(freq=time_window), group_by])
-        else:
-            grouped = data_copy.groupby(pd.Grouper(freq=time_window))
+        in_range = bin_ids >= 0
+        binned = data if in_range.all() else data[in_range]
+        n_bins = int(bin_ids.max()) + 1
+        time_key = pd.Categorical.from_codes(bin_ids[in_range], categories=edges[:n_bins])
         
         # Build time-indexed nested dictionary
         result = {}
-        for key, group in grouped:
-            if group_by:
-                time_key, group_key = key
-                time_str = str(time_key)
-                if time_str not in result:
-                    result[time_str] = {}
-                result[time_str][group_key] = _compute_group_metrics(group, has_anomaly_data)
-            else:
-                time_str = str(key)
-                result[time_str] = _compute_group_metrics(group, has_anomaly_data)
+        if group_by:
+            metrics = _aggregate_group_metrics(binned, [time_key, group_by], has_anomaly_data)
+            for (time_value, group_key), group_metrics in metrics.items():
+                result.setdefault(str(time_value), {})[group_key] = group_metrics
+        else:
+            # Like resampling, report every bin between the first and last reading,
+            # including empty ones (observed=False keeps unused bin categories)
+            metrics = _aggregate_group_metrics(binned, time_key, has_anomaly_data, observed=False)
+            for time_value, group_metrics in metrics.items():
+                result[str(time_value)] = group_metrics
         
         return result
     
     # No time window - compute overall statistics by group_by
     if group_by:
-        grouped = data.groupby(group_by)
-        result = {}
-        
-        for group_name, group_data in grouped:
-            result[group_name] = _compute_group_metrics(group_data, has_anomaly_data)
-        
-        return result
+        return _aggregate_group_metrics(data, group_by, has_anomaly_data)
     else:
         # No grouping at all - compute metrics for entire dataset
-        return {"overall": _compute_group_metrics(data, has_anomaly_data)}
+        single_group = np.zeros(len(data), dtype=np.int8)
+        metrics = _aggregate_group_metrics(data, single_group, has_anomaly_data)
+        return {"overall": metrics[0]}
 
 
-def _compute_group_metrics(group_data: pd.DataFrame, has_anomaly_data: bool) -> Dict[str, float]:
+def _time_bins(
+    timestamps: pd.Series, time_window: str
+) -> Optional[Tuple[pd.DatetimeIndex, np.ndarray]]:
     """
-    Helper function to compute metrics for a group of data.
+    Helper function to assign timestamps to fixed-width time bins.
+    
+    Bins are aligned like ``pd.Grouper(freq=time_window)`` (origin at midnight of
+    the first day) and found with one vectorized ``searchsorted`` over the bin edges.
     
     Args:
-        group_data: DataFrame containing the group's data
+        timestamps: The "timestamp" column of the data
+        time_window: pandas frequency string, e.g. "15min"
+    
+    Returns:
+        Tuple of (bin start edges, bin id per row with -1 for missing timestamps),
+        or None if the frequency is not fixed-width or there are no valid timestamps
+    """
+    offset = pd.tseries.frequencies.to_offset(time_window)
+    if not isinstance(offset, pd.offsets.Tick):
+        return None
+    
+    ts = pd.DatetimeIndex(timestamps)
+    valid = ~ts.isna()
+    if not valid.any():
+        return None
+    
+    width = pd.Timedelta(offset)
+    ts_min = ts[valid].min()
+    day_start = ts_min.normalize()
+    first_edge = day_start + ((ts_min - day_start) // width) * width
+    edges = pd.date_range(first_edge, ts[valid].max() + width, freq=offset)
+    
+    bin_ids = edges.searchsorted(ts, side="right") - 1
+    bin_ids[~valid] = -1
+    return edges, bin_ids
+
+
+def _summarize_with_grouper(
+    data: pd.DataFrame, group_by: Optional[str], time_window: str, has_anomaly_data: bool
+) -> Dict[str, Dict[str, float]]:
+    """
+    Helper function for time-window summaries using pandas' resampling grouper.
+    
+    Args:
+        data: DataFrame with a "timestamp" column
+        group_by: Optional column to group by within each time window
+        time_window: pandas frequency string
         has_anomaly_data: Whether anomaly detection columns are present
     
     Returns:
-        Dictionary of metrics for the group
+        Time-indexed nested dictionary of metrics
     """
-    metrics = {}
+    grouper = pd.Grouper(key="timestamp", freq=time_window)
+    if group_by:
+        metrics = _aggregate_group_metrics(data, [grouper, group_by], has_anomaly_data)
+        result = {}
+        for (time_value, group_key), group_metrics in metrics.items():
+            result.setdefault(str(time_value), {})[group_key] = group_metrics
+        return result
     
-    # Get the value column
-    values = group_data["value"]
+    metrics = _aggregate_group_metrics(data, grouper, has_anomaly_data)
+    return {str(time_value): group_metrics for time_value, group_metrics in metrics.items()}
+
+
+def _aggregate_group_metrics(
+    data: pd.DataFrame,
+    keys,
+    has_anomaly_data: bool,
+    observed: bool = True,
+) -> Dict:
+    """
+    Helper function to compute the metrics of every group in one aggregation.
     
-    # Basic statistics
-    metrics["count"] = int(len(values))
-    metrics["null_count"] = int(values.isna().sum())
+    Indicator columns (null, quality flags, anomalies) are precomputed once and all
+    metrics come from a single ``groupby(...).agg(...)`` call, so the groups are
+    traversed once instead of once per metric and per group.
     
-    # Only compute statistics on non-null values
-    valid_values = values.dropna()
+    Args:
+        data: DataFrame containing the data to summarize
+        keys: Grouping keys accepted by DataFrame.groupby()
+        has_anomaly_data: Whether anomaly detection columns are present
+        observed: Passed to groupby(); False keeps empty categorical groups,
+            which are then returned in category order
     
-    if len(valid_values) > 0:
-        metrics["mean"] = float(valid_values.mean())
-        metrics["std"] = float(valid_values.std()) if len(valid_values) > 1 else 0.0
-        metrics["min"] = float(valid_values.min())
-        metrics["max"] = float(valid_values.max())
-        metrics["median"] = float(valid_values.median())
-    else:
-        # All values are null
-        metrics["mean"] = 0.0
-        metrics["std"] = 0.0
-        metrics["min"] = 0.0
-        metrics["max"] = 0.0
-        metrics["median"] = 0.0
+    Returns:
+        Dictionary mapping each group key to its dictionary of metrics
+    """
+    # Statistics are accumulated in float64 even when values are stored as float32
+    helpers = {
+        "_value": data["value"].to_numpy(dtype=np.float64),
+        "_is_null": data["value"].isna().to_numpy(dtype=np.int64),
+    }
+    aggregations = {
+        "count": ("_value", "size"),
+        "null_count": ("_is_null", "sum"),
+        "mean": ("_value", "mean"),
+        "std": ("_value", "std"),
+        "min": ("_value", "min"),
+        "max": ("_value", "max"),
+        "median": ("_value", "median"),
+    }
     
     # Data quality metrics
-    if "quality" in group_data.columns:
-        total_count = len(group_data)
-        good_count = (group_data["quality"] == "GOOD").sum()
-        bad_count = (group_data["quality"] == "BAD").sum()
-        uncertain_count = (group_data["quality"] == "UNCERTAIN").sum()
-        
-        metrics["good_quality_pct"] = float((good_count / total_count * 100) if total_count > 0 else 0.0)
-        metrics["bad_quality_pct"] = float((bad_count / total_count * 100) if total_count > 0 else 0.0)
-        metrics["uncertain_quality_pct"] = float((uncertain_count / total_count * 100) if total_count > 0 else 0.0)
+    has_quality = "quality" in data.columns
+    if has_quality:
+        quality = data["quality"]
+        for flag in ("GOOD", "BAD", "UNCERTAIN"):
+            helpers[f"_is_{flag}"] = (quality == flag).to_numpy(dtype=np.int64)
+            aggregations[f"{flag}_count"] = (f"_is_{flag}", "sum")
     
     # Anomaly metrics (if available)
+    has_scores = has_anomaly_data and "anomaly_score" in data.columns
     if has_anomaly_data:
-        anomaly_count = group_data["is_anomaly"].sum()
-        total_count = len(group_data)
-        metrics["anomaly_count"] = int(anomaly_count)
-        metrics["anomaly_rate"] = float((anomaly_count / total_count * 100) if total_count > 0 else 0.0)
+        is_anomaly = data["is_anomaly"]
+        helpers["_anomaly_count"] = is_anomaly.to_numpy(dtype=np.int64)
+        aggregations["anomaly_count"] = ("_anomaly_count", "sum")
+        if has_scores:
+            # Sum of scores over anomalous rows, for the average anomaly score
+            helpers["_anomaly_score"] = np.where(
+                (is_anomaly == True).to_numpy(),
+                data["anomaly_score"].to_numpy(dtype=np.float64),
+                0.0,
+            )
+            aggregations["anomaly_score_sum"] = ("_anomaly_score", "sum")
+    
+    # sort=False skips re-sorting the group keys: ingested data is already in
+    # chronological order, so time bins come out in order of appearance anyway.
+    # Empty groups kept by observed=False would be appended last, so sort those.
+    aggregated = (
+        data.assign(**helpers)
+        .groupby(keys, sort=not observed, observed=observed)
+        .agg(**aggregations)
+    )
+    
+    # Derived metrics are computed column-wise on the aggregated frame; the only
+    # per-group Python work left is boxing each row into a dictionary
+    total_count = aggregated["count"].to_numpy(dtype=np.int64)
+    has_rows = total_count > 0
+    per_group = total_count.clip(min=1)
+    
+    def _percentage(counts: pd.Series) -> np.ndarray:
+        return np.where(has_rows, counts.to_numpy(dtype=np.float64) / per_group * 100, 0.0)
+    
+    # Statistics are NaN when there are no valid values (std also for a single
+    # value); report them as 0.0
+    metrics = {
+        "count": total_count,
+        "null_count": aggregated["null_count"].to_numpy(dtype=np.int64),
+    }
+    for name in ("mean", "std", "min", "max", "median"):
+        metrics[name] = aggregated[name].fillna(0.0).to_numpy(dtype=np.float64)
+    
+    if has_quality:
+        for flag, name in (("GOOD", "good"), ("BAD", "bad"), ("UNCERTAIN", "uncertain")):
+            metrics[f"{name}_quality_pct"] = _percentage(aggregated[f"{flag}_count"])
+    
+    if has_anomaly_data:
+        anomaly_count = aggregated["anomaly_count"].to_numpy(dtype=np.int64)
+        metrics["anomaly_count"] = anomaly_count
+        metrics["anomaly_rate"] = _percentage(aggregated["anomaly_count"])
         
         # Average anomaly score for detected anomalies
-        anomalies = group_data[group_data["is_anomaly"] == True]
-        if len(anomalies) > 0 and "anomaly_score" in group_data.columns:
-            metrics["avg_anomaly_score"] = float(anomalies["anomaly_score"].mean())
+        if has_scores:
+            score_sum = aggregated["anomaly_score_sum"].to_numpy(dtype=np.float64)
+            metrics["avg_anomaly_score"] = np.where(
+                anomaly_count > 0, score_sum / anomaly_count.clip(min=1), 0.0
+            )
         else:
-            metrics["avg_anomaly_score"] = 0.0
+            metrics["avg_anomaly_score"] = np.zeros(len(aggregated))
+    
+    # to_dict() boxes the NumPy scalars into built-in ints and floats
+    records = pd.DataFrame(metrics, copy=False).to_dict(orient="records")
+    return dict(zip(aggregated.index, records))
+
+
+def _copy_on_write_enabled() -> bool:
+    """
+    Helper function to check whether pandas copy-on-write is active.
+    
+    Copy-on-write is the only mode in pandas >= 3. On pandas 2 it is opt-in via
+    ``pd.options.mode.copy_on_write`` (the "warn" mode does not enable it).
+    
+    Returns:
+        True if shallow copies are protected from writes by copy-on-write
+    """
+    if int(pd.__version__.split(".", 1)[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+
+def _sort_by_timestamp(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Helper function to order rows chronologically with a fresh RangeIndex.
+    
+    The stable mergesort keeps batch order for equal timestamps, and ignore_index
+    renumbers rows during the sort instead of in a separate reset_index copy. Data
+    that is already in order (e.g. a single in-order batch) skips the reorder and
+    only gets a new index, which shares the column data under copy-on-write.
+    
+    Args:
+        data: DataFrame with a "timestamp" column
     
-    return metrics
+    Returns:
+        DataFrame sorted by timestamp with a RangeIndex
+    """
+    if data["timestamp"].is_monotonic_increasing:
+        return data.reset_index(drop=True)
+    return data.sort_values("timestamp", kind="mergesort", ignore_index=True)
+
+
+def _build_sensor_index(sensors: pd.Series) -> Tuple[pd.Index, np.ndarray, np.ndarray]:
+    """
+    Helper function to group row positions by sensor in CSR (indptr) layout.
+    
+    Rows of the k-th sensor are ``order[indptr[k]:indptr[k + 1]]``, in their
+    original (chronological) order. Building this once and slicing it replaces a
+    full-column comparison per sensor when several sensors are processed.
+    
+    Args:
+        sensors: The "sensor" column of the data
+    
+    Returns:
+        Tuple of (sensor names, row order, indptr); rows with a missing sensor
+        are excluded from every slice
+    """
+    codes, uniques = pd.factorize(sensors)
+    order = np.argsort(codes, kind="stable")
+    n_missing = int((codes < 0).sum())
+    sizes = np.bincount(codes[codes >= 0], minlength=len(uniques))
+    indptr = n_missing + np.concatenate(([0], np.cumsum(sizes)))
+    return pd.Index(uniques), order, indptr
+
+
+def _sensor_rows(
+    sensor_index: Tuple[pd.Index, np.ndarray, np.ndarray], sensor_name: str
+) -> Optional[np.ndarray]:
+    """
+    Helper function to look up a sensor's row positions in a sensor index.
+    
+    Args:
+        sensor_index: Result of _build_sensor_index()
+        sensor_name: Name of the sensor to look up
+    
+    Returns:
+        Sorted array of row positions, or None if the sensor has no rows
+    """
+    names, order, indptr = sensor_index
+    if sensor_name not in names:
+        return None
+    k = names.get_loc(sensor_name)
+    return order[indptr[k]:indptr[k + 1]]
+
+
+def _score_sensor_values(
+    values: np.ndarray,
+    sensor_name: str,
+    method: str,
+    threshold: float,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Helper function to score one sensor's readings with the given method.
+    
+    Args:
+        values: The sensor's readings as float64, in timestamp order (NaN = missing)
+        sensor_name: Name of the sensor, used in error messages
+        method: Detection method - "zscore", "iqr", or "rolling"
+        threshold: Sensitivity parameter (see detect_anomalies)
+    
+    Returns:
+        Tuple of (anomaly scores, anomaly flags), aligned with values. Missing
+        readings and sensors without variance score 0 and are not flagged.
+    
+    Raises:
+        ValueError: If there are too few valid readings for the method
+    """
+    valid_values = values[~np.isnan(values)]
+    
+    # Check if we have sufficient valid data
+    if len(valid_values) < 2:
+        raise ValueError(
+            f"Insufficient data for sensor '{sensor_name}'. Need at least 2 valid readings."
+        )
+    
+    scores = np.zeros(len(values))
+    flags = np.zeros(len(values), dtype=bool)
+    
+    # Apply the selected detection method
+    if method == "zscore":
+        # Z-score method: Flag values beyond threshold standard deviations from mean
+        mean, std = _nan_mean_std(values)
+        
+        # Handle case where std is 0 (all values are the same): no variance means no anomalies
+        if std > 0:
+            # Calculate z-scores for all sensor readings (NaN readings score 0)
+            z_scores = np.abs((values - mean) / std)
+            z_scores = np.where(np.isnan(z_scores), 0.0, z_scores)
+            
+            # Flag anomalies where |z-score| > threshold
+            scores = z_scores
+            flags = z_scores > threshold
+    
+    elif method == "iqr":
+        # IQR method: Flag values beyond threshold * IQR from quartiles
+        q1, q3 = _quartiles(valid_values)
+        iqr = q3 - q1
+        
+        # Handle case where IQR is 0: no variance in middle 50% means no anomalies
+        if iqr > 0:
+            # Calculate bounds
+            lower_bound = q1 - threshold * iqr
+            upper_bound = q3 + threshold * iqr
+            
+            # Anomaly score is the distance outside bounds, normalized by IQR (NaN readings score 0)
+            distance = np.maximum(0, lower_bound - values) + np.maximum(0, values - upper_bound)
+            scores = np.where(np.isnan(distance), 0.0, distance / iqr)
+            
+            # Flag as anomaly if outside bounds
+            flags = (values < lower_bound) | (values > upper_bound)
+    
+    elif method == "rolling":
+        # Rolling method: Flag based on rolling window statistics
+        # Use a window size based on data length (at least 5, max 20)
+        window_size = min(max(5, len(valid_values) // 10), 20)
+        
+        if len(valid_values) < window_size:
+            raise ValueError(
+                f"Insufficient data for rolling method. Need at least {window_size} valid readings."
+            )
+        
+        # Fallback for windows where the rolling std is 0 or undefined
+        global_std = valid_values.std(ddof=1)
+        fallback_std = global_std if global_std > 0 else 1.0
+        
+        # Windows follow row order (timestamp order after ingest_data)
+        rolling_zscore_kernel = _load_rolling_zscore_kernel()
+        if rolling_zscore_kernel is not None:
+            # Fused, multi-threaded kernel when numba is installed
+            deviations = np.empty(len(values))
+            rolling_zscore_kernel(values, window_size, fallback_std, deviations)
+        else:
+            # Calculate rolling mean and std in O(N) via cumulative sums
+            rolling_mean, rolling_std = _centered_rolling_mean_std(values, window_size)
+            rolling_std = np.where(
+                np.isnan(rolling_std) | (rolling_std == 0), fallback_std, rolling_std
+            )
+            
+            # Calculate deviation from rolling statistics
+            deviations = np.abs((values - rolling_mean) / rolling_std)
+            deviations = np.where(np.isnan(deviations), 0.0, deviations)
+        
+        # Flag anomalies
+        scores = deviations
+        flags = deviations > threshold
+    
+    return scores, flags
+
+
+def _quartiles(values: np.ndarray) -> Tuple[float, float]:
+    """
+    Helper function to compute the first and third quartiles of non-NaN values.
+    
+    Uses a single ``np.partition`` (introselect, O(N)) to place the order
+    statistics around both quartile positions instead of fully sorting, then
+    interpolates linearly between neighbours to match ``Series.quantile``.
+    
+    Args:
+        values: float64 array without NaN values (at least one element)
+    
+    Returns:
+        Tuple of (q1, q3)
+    """
+    n = len(values)
+    positions = (0.25 * (n - 1), 0.75 * (n - 1))
+    kth = sorted({min(int(p) + offset, n - 1) for p in positions for offset in (0, 1)})
+    part = np.partition(values, kth)
+    
+    quartiles = []
+    for p in positions:
+        lo = int(p)
+        hi = min(lo + 1, n - 1)
+        quartiles.append(float(part[lo] + (part[hi] - part[lo]) * (p - lo)))
+    return quartiles[0], quartiles[1]
+
+
+def _nan_mean_std(values: np.ndarray) -> Tuple[float, float]:
+    """
+    Helper function to compute mean and sample std (ddof=1) of the non-NaN values.
+    
+    Both moments are accumulated in one sweep with the NaN filter fused into the
+    reduction via ``where=``, so no compacted copy of the valid values is built.
+    Sums are taken relative to the first valid value, which keeps the variance
+    exact for constant data and avoids cancellation for large offsets.
+    
+    Args:
+        values: float64 array that may contain NaN
+    
+    Returns:
+        Tuple of (mean, std); std is NaN when fewer than 2 valid values exist
+    """
+    finite = ~np.isnan(values)
+    n = int(finite.sum())
+    if n == 0:
+        return float("nan"), float("nan")
+    
+    shift = values[np.argmax(finite)]
+    shifted = values - shift
+    s1 = np.add.reduce(shifted, where=finite)
+    s2 = np.add.reduce(shifted * shifted, where=finite)
+    
+    mean = shift + s1 / n
+    if n < 2:
+        return float(mean), float("nan")
+    var = max((s2 - s1 * s1 / n) / (n - 1), 0.0)
+    return float(mean), float(np.sqrt(var))
+
+
+def _centered_rolling_mean_std(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Helper function to compute centered rolling mean and sample std (ddof=1).
+    
+    Matches ``Series.rolling(window, center=True, min_periods=1)`` but works from
+    cumulative sums, so the cost is O(N) regardless of the window size. Values are
+    shifted by their mean first to limit cancellation in the sum of squares.
+    
+    Uses bottleneck's C moving-window kernels instead when it is installed.
+    
+    Args:
+        values: float64 array that may contain NaN
+        window: Rolling window size
+    
+    Returns:
+        Tuple of (rolling_mean, rolling_std) arrays; mean is NaN for windows
+        without valid values, std is NaN for windows with fewer than 2
+    """
+    if bottleneck is not None:
+        return _bottleneck_rolling_mean_std(values, window)
+    
+    n = len(values)
+    finite = ~np.isnan(values)
+    shift = values[finite].mean() if finite.any() else 0.0
+    shifted = np.where(finite, values - shift, 0.0)
+    
+    c1 = np.concatenate(([0.0], np.cumsum(shifted)))
+    c2 = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    cn = np.concatenate(([0], np.cumsum(finite)))
+    
+    # Same window alignment as pandas' center=True: [i - window // 2, i - window // 2 + window)
+    start = np.arange(n) - window // 2
+    lo = np.clip(start, 0, n)
+    hi = np.clip(start + window, 0, n)
+    
+    counts = cn[hi] - cn[lo]
+    s1 = c1[hi] - c1[lo]
+    s2 = c2[hi] - c2[lo]
+    
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = s1 / counts
+        var = (s2 - s1 * mean) / (counts - 1)
+    # Clamp rounding residue from the cumulative sums (relative to the overall
+    # spread) so flat windows report exactly zero std, as pandas does
+    tolerance = 1e-12 * c2[-1] / max(cn[-1], 1)
+    var = np.where(var > tolerance, var, 0.0)
+    std = np.where(counts >= 2, np.sqrt(var), np.nan)
+    mean = np.where(counts >= 1, mean + shift, np.nan)
+    return mean, std
+
+
+def _bottleneck_rolling_mean_std(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Helper function to compute centered rolling mean and std with bottleneck.
+    
+    bottleneck only provides trailing windows, so the input is padded with
+    ``window - 1 - window // 2`` trailing NaNs and the output shifted back, which
+    gives the same alignment as pandas' ``center=True``.
+    
+    Args:
+        values: float64 array that may contain NaN
+        window: Rolling window size
+    
+    Returns:
+        Tuple of (rolling_mean, rolling_std) arrays, as _centered_rolling_mean_std
+    """
+    lag = window - 1 - window // 2
+    padded = np.concatenate((values, np.full(lag, np.nan)))
+    mean = bottleneck.move_mean(padded, window, min_count=1)[lag:]
+    std = bottleneck.move_std(padded, window, min_count=2, ddof=1)[lag:]
+    
+    # bottleneck's running sums leave a small residue on flat windows; clamp it
+    # relative to the overall spread so they report exactly zero std, as pandas does
+    finite = ~np.isnan(values)
+    if finite.any():
+        tolerance = 1e-12 * np.mean(np.square(values[finite] - values[finite].mean()))
+        std = np.where(std * std > tolerance, std, np.where(np.isnan(std), np.nan, 0.0))
+    return mean, std
+
+
+@lru_cache(maxsize=None)
+def _load_rolling_zscore_kernel():
+    """
+    Helper function to import the optional numba rolling z-score kernel.
+    
+    numba is only imported the first time the rolling method runs, so importing
+    this module (and collecting tests) does not pay for it.
+    
+    Returns:
+        The compiled kernel, or None if numba is not installed
+    """
+    try:
+        from ._numba_kernels import rolling_zscore_kernel
+    except ImportError:  # numba is an optional accelerator
+        return None
+    return rolling_zscore_kernel
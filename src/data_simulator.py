@@ -7,10 +7,11 @@ realistic issues like connection dropouts, missing values, and timing jitter.
 DO NOT MODIFY THIS FILE - It simulates real-world industrial data conditions.
 """
 
-import random
+import asyncio
+import os
 import time
-from typing import Dict, List, Optional, Union
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Union
+from datetime import datetime
 import pandas as pd
 import numpy as np
 
@@ -25,22 +26,39 @@ class IndustrialDataSimulator:
     - Timestamp jitter and out-of-order records
     - Duplicate readings
     - Sudden sensor spikes/anomalies
-    - Variable latency
+    - Variable latency (set SIM_NO_LATENCY=1 to disable)
     """
     
-    def __init__(self, seed: Optional[int] = None, dropout_rate: float = 0.07):
+    # Per-reading event probabilities
+    _P_MISS = 0.03  # missing values (2-5% of readings)
+    _P_ANOM = 0.01  # anomalies/spikes (1% of the non-missing readings)
+    _P_DUP = 0.005  # duplicated readings (0.5% of readings)
+    
+    # Quality categories; quality codes index this tuple
+    _QUALITIES = ("GOOD", "UNCERTAIN", "BAD")
+    
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        dropout_rate: float = 0.07,
+        deterministic: bool = False
+    ):
         """
         Initialize the simulator.
         
         Args:
-            seed: Random seed for reproducibility (None for random)
+            seed: Random seed for reproducibility (None for random). Seeds this
+                instance's own generator; the global random/np.random state is
+                left untouched, so simulators can run side by side in threads
             dropout_rate: Probability of connection dropout (0.0-1.0)
+            deterministic: Disable all flakiness (dropouts, missing values, spikes,
+                duplicates, jitter, shuffling and latency); every reading is the
+                sensor's baseline at an exact interval. Intended for tests
         """
         self.seed = seed
-        self.dropout_rate = dropout_rate
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        self.deterministic = deterministic
+        self.dropout_rate = 0.0 if deterministic else dropout_rate
+        self._rng = np.random.default_rng(seed)
         
         self.sensors = {
             "temperature": {"baseline": 65.0, "variance": 2.5, "unit": "°C"},
@@ -49,13 +67,32 @@ class IndustrialDataSimulator:
             "flow_rate": {"baseline": 15.2, "variance": 0.8, "unit": "L/min"},
         }
         
+        # Numeric sensor config as parallel arrays, in self.sensors order, so
+        # readings for all sensors can be drawn in one broadcast call
+        self._baselines = np.fromiter(
+            (c["baseline"] for c in self.sensors.values()), dtype=np.float64
+        )
+        self._variances = np.fromiter(
+            (c["variance"] for c in self.sensors.values()), dtype=np.float64
+        )
+        
+        # Per-sensor categorical codes and dtypes for the string columns
+        units = [c["unit"] for c in self.sensors.values()]
+        unit_categories = list(dict.fromkeys(units))
+        self._sensor_codes = np.arange(len(self.sensors), dtype=np.int8)
+        self._unit_codes = np.array([unit_categories.index(unit) for unit in units], dtype=np.int8)
+        self._sensor_dtype = pd.CategoricalDtype(list(self.sensors))
+        self._unit_dtype = pd.CategoricalDtype(unit_categories)
+        self._quality_dtype = pd.CategoricalDtype(self._QUALITIES)
+        
         self.start_time = datetime.now()
         self.read_count = 0
     
     def read_sensors(
         self, 
         duration_seconds: int = 60, 
-        interval_seconds: float = 1.0
+        interval_seconds: float = 1.0,
+        fast: bool = False
     ) -> pd.DataFrame:
         """
         Simulate reading sensor data over a time period.
@@ -63,6 +100,7 @@ class IndustrialDataSimulator:
         Args:
             duration_seconds: How long to simulate data collection
             interval_seconds: Time between readings
+            fast: Skip the simulated latency (the caller accounts for it)
         
         Returns:
             DataFrame with columns: timestamp, sensor, value, unit, quality
@@ -70,63 +108,42 @@ class IndustrialDataSimulator:
         Raises:
             ConnectionError: Randomly raised to simulate connection issues
         """
-        # Simulate random connection dropout
-        if random.random() < self.dropout_rate:
-            raise ConnectionError(
-                f"Simulated connection dropout at read #{self.read_count}"
-            )
+        data = self._build_readings(duration_seconds, interval_seconds)
         
-        records = []
-        num_readings = int(duration_seconds / interval_seconds)
+        # Add simulated latency
+        if not fast:
+            self._simulate_latency()
         
-        for i in range(num_readings):
-            base_timestamp = self.start_time + timedelta(seconds=i * interval_seconds)
-            
-            # Add timestamp jitter (±10% of interval)
-            jitter = random.uniform(-interval_seconds * 0.1, interval_seconds * 0.1)
-            timestamp = base_timestamp + timedelta(seconds=jitter)
-            
-            for sensor_name, config in self.sensors.items():
-                # Simulate missing values (2-5% of readings)
-                if random.random() < 0.03:
-                    value = np.nan
-                    quality = "BAD"
-                # Simulate anomalies/spikes (1% of readings)
-                elif random.random() < 0.01:
-                    value = config["baseline"] + random.choice([-1, 1]) * config["variance"] * 10
-                    quality = "UNCERTAIN"
-                else:
-                    # Normal reading with gaussian noise
-                    value = config["baseline"] + np.random.normal(0, config["variance"])
-                    quality = "GOOD"
-                
-                records.append({
-                    "timestamp": timestamp,
-                    "sensor": sensor_name,
-                    "value": value,
-                    "unit": config["unit"],
-                    "quality": quality
-                })
-                
-                # Occasionally duplicate a reading (0.5% chance)
-                if random.random() < 0.005:
-                    records.append(records[-1].copy())
+        return data
+    
+    async def read_sensors_async(
+        self, 
+        duration_seconds: int = 60, 
+        interval_seconds: float = 1.0
+    ) -> pd.DataFrame:
+        """
+        Simulate reading sensor data, awaiting the latency instead of blocking.
         
-        self.read_count += 1
+        Same as read_sensors(), but the simulated latency is an asyncio.sleep so
+        concurrent reads overlap on a single thread.
         
-        # Shuffle some records to simulate out-of-order arrival
-        if len(records) > 10:
-            num_shuffle = random.randint(1, min(5, len(records) // 10))
-            indices = random.sample(range(len(records)), num_shuffle)
-            for i in range(0, len(indices) - 1, 2):
-                if i + 1 < len(indices):
-                    idx1, idx2 = indices[i], indices[i + 1]
-                    records[idx1], records[idx2] = records[idx2], records[idx1]
+        Args:
+            duration_seconds: How long to simulate data collection
+            interval_seconds: Time between readings
+        
+        Returns:
+            DataFrame with columns: timestamp, sensor, value, unit, quality
+            
+        Raises:
+            ConnectionError: Randomly raised to simulate connection issues
+        """
+        data = self._build_readings(duration_seconds, interval_seconds)
         
         # Add simulated latency
-        time.sleep(random.uniform(0.01, 0.05))
+        if self._latency_enabled():
+            await asyncio.sleep(self._rng.uniform(0.01, 0.05))
         
-        return pd.DataFrame(records)
+        return data
     
     def get_batch_readings(
         self, 
@@ -143,16 +160,199 @@ class IndustrialDataSimulator:
             batch_interval: Interval between readings in each batch
         
         Returns:
-            List of DataFrames (may be fewer than num_batches due to dropouts)
+            List of non-empty DataFrames (may be fewer than num_batches due to dropouts)
         """
         batches = []
         for i in range(num_batches):
             try:
-                batch = self.read_sensors(batch_duration, batch_interval)
-                batches.append(batch)
+                batch = self.read_sensors(batch_duration, batch_interval, fast=True)
+                if not batch.empty:
+                    batches.append(batch)
             except ConnectionError as e:
                 # In real systems, connection errors happen - candidates must handle this
                 print(f"Batch {i+1}/{num_batches} failed: {e}")
                 continue
         
+        # Reads model independent I/O, so their latencies overlap: wait once
+        # for the slowest instead of sleeping after every read
+        if num_batches > 0:
+            self._simulate_latency(num_reads=num_batches)
+        
+        return batches
+    
+    async def get_batch_readings_async(
+        self, 
+        num_batches: int = 5, 
+        batch_duration: int = 30,
+        batch_interval: float = 1.0
+    ) -> List[pd.DataFrame]:
+        """
+        Simulate multiple concurrent batch reads with potential failures.
+        
+        Args:
+            num_batches: Number of batches to attempt
+            batch_duration: Duration of each batch in seconds
+            batch_interval: Interval between readings in each batch
+        
+        Returns:
+            List of non-empty DataFrames (may be fewer than num_batches due to dropouts)
+        """
+        results = await asyncio.gather(
+            *(self.read_sensors_async(batch_duration, batch_interval) for _ in range(num_batches)),
+            return_exceptions=True,
+        )
+        
+        batches = []
+        for i, result in enumerate(results):
+            if isinstance(result, ConnectionError):
+                print(f"Batch {i+1}/{num_batches} failed: {result}")
+            elif isinstance(result, BaseException):
+                raise result
+            elif not result.empty:
+                batches.append(result)
+        
         return batches
+    
+    def _build_readings(self, duration_seconds: int, interval_seconds: float) -> pd.DataFrame:
+        """
+        Generate one read's worth of sensor data, without simulated latency.
+        
+        Args:
+            duration_seconds: How long to simulate data collection
+            interval_seconds: Time between readings
+        
+        Returns:
+            DataFrame with columns: timestamp, sensor, value, unit, quality
+            
+        Raises:
+            ConnectionError: Randomly raised to simulate connection issues
+        """
+        # Fail before any data is generated
+        self._maybe_dropout()
+        
+        num_readings = int(duration_seconds / interval_seconds)
+        num_sensors = len(self._baselines)
+        timestamps = pd.date_range(
+            self.start_time, periods=num_readings, freq=pd.Timedelta(seconds=interval_seconds)
+        )
+        
+        if self.deterministic:
+            # Baseline readings at exact intervals, in order, without any random draws
+            values = np.broadcast_to(self._baselines, (num_readings, num_sensors))
+            quality_codes = np.zeros((num_readings, num_sensors), dtype=np.int8)
+            duplicate = np.zeros((num_readings, num_sensors), dtype=bool)
+        else:
+            values, quality_codes, duplicate = self._draw_readings(num_readings, num_sensors)
+            
+            # Add timestamp jitter (±10% of interval)
+            max_jitter = interval_seconds * 0.1
+            jitter = self._rng.uniform(-max_jitter, max_jitter, num_readings)
+            timestamps = timestamps + pd.to_timedelta(jitter, unit="s")
+        
+        # Keep the microsecond resolution of datetime objects
+        timestamps = timestamps.as_unit("us")
+        
+        # Build columns rather than per-row records, in reading-major order
+        # (every sensor for the first reading, then the next reading, ...).
+        # String columns are dictionary-encoded as categoricals
+        columns = {
+            "timestamp": np.repeat(timestamps.to_numpy(), num_sensors),
+            "sensor": pd.Categorical.from_codes(
+                np.tile(self._sensor_codes, num_readings), dtype=self._sensor_dtype
+            ),
+            "value": values.ravel(),
+            "unit": pd.Categorical.from_codes(
+                np.tile(self._unit_codes, num_readings), dtype=self._unit_dtype
+            ),
+            "quality": pd.Categorical.from_codes(quality_codes.ravel(), dtype=self._quality_dtype),
+        }
+        
+        # Row positions to emit; duplicated readings repeat right after the original
+        rows = np.repeat(np.arange(duplicate.size), 1 + duplicate.ravel())
+        
+        self.read_count += 1
+        
+        # Shuffle some records to simulate out-of-order arrival: pick distinct
+        # positions and swap them pairwise in one fancy-indexing step
+        if not self.deterministic and len(rows) > 10:
+            num_shuffle = self._rng.integers(1, min(5, len(rows) // 10) + 1)
+            pairs = self._rng.choice(
+                len(rows), num_shuffle - num_shuffle % 2, replace=False
+            ).reshape(2, -1)
+            rows[pairs[0]], rows[pairs[1]] = rows[pairs[1]], rows[pairs[0]]
+        
+        # The gathered columns are fresh, typed arrays: hand them to the frame
+        # without the defensive copy pandas makes for dict input
+        return pd.DataFrame({name: column[rows] for name, column in columns.items()}, copy=False)
+    
+    def _draw_readings(
+        self, num_readings: int, num_sensors: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Draw noisy readings with missing values, spikes and duplicates.
+        
+        Args:
+            num_readings: Number of readings per sensor
+            num_sensors: Number of sensors
+        
+        Returns:
+            Tuple of (values, quality_codes, duplicate) arrays of shape
+            (num_readings, num_sensors); quality codes index GOOD/UNCERTAIN/BAD
+        """
+        # Two uniform draws per (reading, sensor): one picks the reading's outcome,
+        # the other decides whether it is duplicated
+        draws = self._rng.random((num_readings, num_sensors, 2))
+        outcome = draws[..., 0]
+        duplicate = draws[..., 1] < self._P_DUP
+        
+        # The outcome draw is split into consecutive ranges: [0, P_MISS) is a
+        # missing value, the next (1 - P_MISS) * P_ANOM is a spike (lower half
+        # negative, upper half positive), the rest is a normal reading
+        spike_limit = self._P_MISS + (1 - self._P_MISS) * self._P_ANOM
+        quality_codes = np.select(
+            [outcome < self._P_MISS, outcome < spike_limit], [2, 1], default=0
+        ).astype(np.int8)
+        spike_sign = np.where(outcome < (self._P_MISS + spike_limit) / 2, -1, 1)
+        
+        # Normal readings with gaussian noise, for all sensors at once: scale one
+        # standard-normal block per sensor instead of broadcasting the scale parameter
+        noise = self._rng.standard_normal((num_readings, num_sensors))
+        noise *= self._variances
+        values = np.select(
+            [quality_codes == 2, quality_codes == 1],
+            [np.nan, self._baselines + spike_sign * self._variances * 10],
+            default=self._baselines + noise,
+        )
+        return values, quality_codes, duplicate
+    
+    def _maybe_dropout(self) -> None:
+        """
+        Simulate a random connection dropout.
+        
+        Raises:
+            ConnectionError: With probability dropout_rate
+        """
+        if not self.deterministic and self._rng.random() < self.dropout_rate:
+            raise ConnectionError(
+                f"Simulated connection dropout at read #{self.read_count}"
+            )
+    
+    def _latency_enabled(self) -> bool:
+        """
+        Check whether simulated latency is enabled (not deterministic and
+        SIM_NO_LATENCY unset or "0").
+        
+        Returns:
+            True if reads should sleep
+        """
+        return not self.deterministic and os.environ.get("SIM_NO_LATENCY", "") in ("", "0")
+    
+    def _simulate_latency(self, num_reads: int = 1) -> None:
+        """
+        Sleep to simulate read latency, unless disabled via SIM_NO_LATENCY.
+        
+        Args:
+            num_reads: Number of overlapping reads; sleeps for the slowest one
+        """
+        if self._latency_enabled():
+            time.sleep(self._rng.uniform(0.01, 0.05, num_reads).max())
@@ -11,13 +11,76 @@ import pytest
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-import sys
-from pathlib import Path
 
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.data_processing import (
+    ingest_data,
+    detect_anomalies,
+    detect_anomalies_all,
+    summarize_metrics,
+)
+from src.data_simulator import IndustrialDataSimulator
 
-from src.data_processing import ingest_data, detect_anomalies, summarize_metrics
+
+# Read-only frames shared across tests; built once per module. Tests must not
+# mutate them (the functions under test never modify their input).
+@pytest.fixture(scope="module")
+def valid_data():
+    """Create valid 10-row temperature data."""
+    timestamps = [datetime.now() + timedelta(seconds=i) for i in range(10)]
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "sensor": ["temperature"] * 10,
+        "value": [65.0 + i * 0.5 for i in range(10)],
+        "unit": ["°C"] * 10,
+        "quality": ["GOOD"] * 10,
+    })
+
+
+@pytest.fixture(scope="module")
+def constant_data():
+    """Create 10-row temperature data with a constant value (zero variance)."""
+    return pd.DataFrame({
+        "timestamp": [datetime.now() + timedelta(seconds=i) for i in range(10)],
+        "sensor": ["temperature"] * 10,
+        "value": [65.0] * 10,  # All same value
+        "unit": ["°C"] * 10,
+        "quality": ["GOOD"] * 10,
+    })
+
+
+@pytest.fixture(scope="module")
+def multi_sensor_data():
+    """Create data with two well-populated sensors and one sparse sensor."""
+    rng = np.random.default_rng(7)
+    n = 40
+    timestamps = [datetime(2025, 1, 1) + timedelta(seconds=i) for i in range(n)]
+    temperature = rng.normal(65.0, 2.5, n)
+    temperature[10] = 120.0
+    pressure = rng.normal(101.3, 1.2, n)
+    pressure[5] = np.nan
+    df = pd.DataFrame({
+        "timestamp": timestamps * 2 + [timestamps[0]],
+        "sensor": ["temperature"] * n + ["pressure"] * n + ["vibration"],
+        "value": np.concatenate([temperature, pressure, [0.5]]),
+        "unit": ["°C"] * n + ["kPa"] * n + ["mm/s"],
+        "quality": ["GOOD"] * (2 * n + 1),
+    })
+    return ingest_data([df])
+
+
+@pytest.fixture(scope="module")
+def gapped_data():
+    """Create data with a gap spanning several empty time bins."""
+    minutes = [0, 1, 2, 3, 17, 18, 19]
+    timestamps = [datetime(2025, 1, 1, 6, 3, 10) + timedelta(minutes=m) for m in minutes]
+    df = pd.DataFrame({
+        "timestamp": timestamps * 2,
+        "sensor": ["temperature"] * 7 + ["pressure"] * 7,
+        "value": [65.0 + i for i in range(7)] + [101.0 + i for i in range(7)],
+        "unit": ["°C"] * 7 + ["kPa"] * 7,
+        "quality": ["GOOD"] * 14,
+    })
+    return ingest_data([df])
 
 
 class TestIngestDataErrors:
@@ -52,6 +115,12 @@ class TestIngestDataErrors:
         with pytest.raises(ValueError, match="All data batches are empty"):
             ingest_data([empty1, empty2])
     
+    def test_empty_batches_rejected_before_column_validation(self):
+        """Empty batches should short-circuit before any column checks or concatenation."""
+        empty_without_columns = pd.DataFrame({"value": pd.Series([], dtype=float)})
+        with pytest.raises(ValueError, match="All data batches are empty"):
+            ingest_data([pd.DataFrame(), empty_without_columns])
+    
     def test_missing_required_columns_raises_valueerror(self):
         """Should raise ValueError when required columns are missing."""
         incomplete_df = pd.DataFrame({
@@ -75,23 +144,18 @@ class TestIngestDataErrors:
 class TestDetectAnomaliesErrors:
     """Tests for error handling in detect_anomalies()."""
     
-    @pytest.fixture
-    def valid_data(self):
-        """Create valid test data."""
-        timestamps = [datetime.now() + timedelta(seconds=i) for i in range(10)]
-        return pd.DataFrame({
-            "timestamp": timestamps,
-            "sensor": ["temperature"] * 10,
-            "value": [65.0 + i * 0.5 for i in range(10)],
-            "unit": ["°C"] * 10,
-            "quality": ["GOOD"] * 10,
-        })
-    
     def test_nonexistent_sensor_raises_valueerror(self, valid_data):
         """Should raise ValueError when sensor doesn't exist."""
         with pytest.raises(ValueError, match="Sensor 'nonexistent' not found"):
             detect_anomalies(valid_data, "nonexistent")
     
+    def test_unused_category_sensor_raises_valueerror(self, valid_data):
+        """Should treat a sensor that is only an unused category as not found."""
+        clean_data = ingest_data([valid_data])
+        clean_data["sensor"] = clean_data["sensor"].cat.add_categories(["pressure"])
+        with pytest.raises(ValueError, match="Sensor 'pressure' not found"):
+            detect_anomalies(clean_data, "pressure")
+    
     def test_invalid_method_raises_valueerror(self, valid_data):
         """Should raise ValueError for unsupported method."""
         with pytest.raises(ValueError, match="Method 'invalid' not supported"):
@@ -189,32 +253,18 @@ class TestEdgeCases:
         with pytest.raises(ValueError, match="Insufficient data"):
             detect_anomalies(clean_data, "temperature")
     
-    def test_zero_variance_data_zscore(self):
+    def test_zero_variance_data_zscore(self, constant_data):
         """Should handle constant values (zero variance) with z-score method."""
-        df = pd.DataFrame({
-            "timestamp": [datetime.now() + timedelta(seconds=i) for i in range(10)],
-            "sensor": ["temperature"] * 10,
-            "value": [65.0] * 10,  # All same value
-            "unit": ["°C"] * 10,
-            "quality": ["GOOD"] * 10,
-        })
-        clean_data = ingest_data([df])
+        clean_data = ingest_data([constant_data])
         result = detect_anomalies(clean_data, "temperature", method="zscore")
         
         # No anomalies should be detected (all scores should be 0)
         assert result["is_anomaly"].sum() == 0
         assert (result["anomaly_score"] == 0.0).all()
     
-    def test_zero_variance_data_iqr(self):
+    def test_zero_variance_data_iqr(self, constant_data):
         """Should handle constant values (zero variance) with IQR method."""
-        df = pd.DataFrame({
-            "timestamp": [datetime.now() + timedelta(seconds=i) for i in range(10)],
-            "sensor": ["temperature"] * 10,
-            "value": [65.0] * 10,  # All same value
-            "unit": ["°C"] * 10,
-            "quality": ["GOOD"] * 10,
-        })
-        clean_data = ingest_data([df])
+        clean_data = ingest_data([constant_data])
         result = detect_anomalies(clean_data, "temperature", method="iqr")
         
         # No anomalies should be detected
@@ -257,6 +307,29 @@ class TestEdgeCases:
         assert temp_metrics["mean"] == 0.0
         assert temp_metrics["std"] == 0.0
     
+    def test_all_null_groups_among_many_groups(self):
+        """Should keep exact statistics when thousands of groups include all-null ones."""
+        num_sensors = 1200
+        sensors = np.repeat([f"sensor_{i:04d}" for i in range(num_sensors)], 3)
+        values = np.tile([1.0, 2.0, 6.0], num_sensors)
+        values[:30] = np.nan  # the first 10 sensors have no valid values
+        df = pd.DataFrame({
+            "timestamp": pd.date_range("2024-01-01", periods=len(sensors), freq="s"),
+            "sensor": sensors,
+            "value": values,
+            "unit": "°C",
+            "quality": "GOOD",
+        }, copy=False)
+        metrics = summarize_metrics(ingest_data([df]), group_by="sensor")
+        
+        assert len(metrics) == num_sensors
+        assert metrics["sensor_0000"]["mean"] == 0.0
+        assert metrics["sensor_0000"]["min"] == 0.0
+        assert metrics["sensor_0000"]["null_count"] == 3
+        assert metrics["sensor_1199"]["mean"] == 3.0
+        assert metrics["sensor_1199"]["std"] == pytest.approx(np.std([1.0, 2.0, 6.0], ddof=1))
+        assert metrics["sensor_1199"]["max"] == 6.0
+    
     def test_extreme_outlier_detection(self):
         """Should detect obvious outliers with z-score method."""
         # Use more realistic data with variance to test outlier detection
@@ -297,6 +370,86 @@ class TestEdgeCases:
         pressure_rows = result[result["sensor"] == "pressure"]
         assert all(pressure_rows["detection_method"] == "")
     
+    def test_sensor_index_groups_rows_in_order(self):
+        """Sensor index should slice each sensor's row positions in original order."""
+        from src.data_processing import _build_sensor_index, _sensor_rows
+        
+        sensors = pd.Series(["a", "b", None, "a", "c", "b", "a"])
+        index = _build_sensor_index(sensors)
+        
+        assert _sensor_rows(index, "a").tolist() == [0, 3, 6]
+        assert _sensor_rows(index, "b").tolist() == [1, 5]
+        assert _sensor_rows(index, "c").tolist() == [4]
+        assert _sensor_rows(index, "missing") is None
+    
+    @pytest.mark.parametrize("n", [2, 3, 4, 5, 10, 101])
+    def test_quartiles_match_pandas(self, n):
+        """Partition-based quartiles should match pandas' linear interpolation."""
+        from src.data_processing import _quartiles
+        
+        values = np.random.default_rng(n).normal(15.2, 0.8, n)
+        q1, q3 = _quartiles(values)
+        assert q1 == pytest.approx(pd.Series(values).quantile(0.25))
+        assert q3 == pytest.approx(pd.Series(values).quantile(0.75))
+    
+    @pytest.mark.parametrize("window", [5, 6, 20])
+    def test_rolling_stats_match_pandas(self, window, monkeypatch):
+        """Cumulative-sum rolling stats should match pandas' centered rolling window."""
+        import src.data_processing as data_processing
+        from src.data_processing import _centered_rolling_mean_std
+        
+        # Exercise the NumPy path even when bottleneck is installed
+        monkeypatch.setattr(data_processing, "bottleneck", None)
+        
+        rng = np.random.default_rng(0)
+        values = rng.normal(65.0, 2.5, 120)
+        values[rng.random(120) < 0.1] = np.nan
+        values[40:60] = 65.0  # flat stretch must report exactly zero std
+        
+        mean, std = _centered_rolling_mean_std(values, window)
+        rolling = pd.Series(values).rolling(window=window, center=True, min_periods=1)
+        
+        np.testing.assert_allclose(mean, rolling.mean().to_numpy(), atol=1e-9)
+        np.testing.assert_allclose(std, rolling.std().to_numpy(), atol=1e-7)
+        assert np.array_equal(std == 0, rolling.std().to_numpy() == 0)
+    
+    @pytest.mark.parametrize("window", [5, 6, 20])
+    def test_bottleneck_rolling_stats_match_pandas(self, window):
+        """The optional bottleneck rolling path should match pandas' centered window."""
+        pytest.importorskip("bottleneck")
+        from src.data_processing import _bottleneck_rolling_mean_std
+        
+        rng = np.random.default_rng(0)
+        values = rng.normal(65.0, 2.5, 120)
+        values[rng.random(120) < 0.1] = np.nan
+        values[40:80] = 65.0
+        
+        mean, std = _bottleneck_rolling_mean_std(values, window)
+        rolling = pd.Series(values).rolling(window=window, center=True, min_periods=1)
+        
+        np.testing.assert_allclose(mean, rolling.mean().to_numpy(), atol=1e-9)
+        np.testing.assert_allclose(std, rolling.std().to_numpy(), atol=1e-7)
+        assert np.array_equal(std == 0, rolling.std().to_numpy() == 0)
+    
+    def test_numba_rolling_kernel_matches_numpy_path(self):
+        """The optional numba rolling kernel should match the NumPy implementation."""
+        pytest.importorskip("numba")
+        from src.data_processing import _centered_rolling_mean_std, _load_rolling_zscore_kernel
+        
+        rng = np.random.default_rng(1)
+        values = rng.normal(101.3, 1.2, 200)
+        values[rng.random(200) < 0.1] = np.nan
+        values[80:100] = 101.3
+        fallback_std = float(np.nanstd(values, ddof=1))
+        
+        kernel_scores = np.empty(len(values))
+        _load_rolling_zscore_kernel()(values, 7, fallback_std, kernel_scores)
+        
+        mean, std = _centered_rolling_mean_std(values, 7)
+        std = np.where(np.isnan(std) | (std == 0), fallback_std, std)
+        expected = np.nan_to_num(np.abs((values - mean) / std), nan=0.0)
+        np.testing.assert_allclose(kernel_scores, expected, atol=1e-9)
+    
     def test_time_window_aggregation(self):
         """Should properly aggregate metrics by time window."""
         timestamps = [datetime(2025, 1, 1, 0, i, 0) for i in range(10)]
@@ -319,6 +472,74 @@ class TestEdgeCases:
             assert "temperature" in sensor_groups
 
 
+class TestBatchAnomalyDetection:
+    """Tests for detect_anomalies_all()."""
+    
+    @pytest.mark.parametrize("max_workers", [1, 4, None])
+    @pytest.mark.parametrize("method", ["zscore", "iqr", "rolling"])
+    def test_matches_per_sensor_detection(self, multi_sensor_data, method, max_workers):
+        """Should produce the same scores as calling detect_anomalies per sensor."""
+        result = detect_anomalies_all(
+            multi_sensor_data, method=method, threshold=2.0, max_workers=max_workers
+        )
+        assert len(result) == len(multi_sensor_data)
+        
+        for sensor in ("temperature", "pressure"):
+            expected = detect_anomalies(multi_sensor_data, sensor, method=method, threshold=2.0)
+            rows = (multi_sensor_data["sensor"] == sensor).to_numpy()
+            np.testing.assert_allclose(
+                result["anomaly_score"].to_numpy()[rows],
+                expected["anomaly_score"].to_numpy()[rows],
+                rtol=1e-6,
+            )
+            np.testing.assert_array_equal(
+                result["is_anomaly"].to_numpy()[rows],
+                expected["is_anomaly"].to_numpy()[rows],
+            )
+            assert (result.loc[rows, "detection_method"] == method).all()
+    
+    def test_insufficient_sensor_left_unscored(self, multi_sensor_data):
+        """Should skip sensors without enough valid readings instead of raising."""
+        result = detect_anomalies_all(multi_sensor_data, method="zscore")
+        vibration = result[result["sensor"] == "vibration"]
+        assert (vibration["detection_method"] == "").all()
+        assert not vibration["is_anomaly"].any()
+    
+    def test_invalid_method_raises_valueerror(self, multi_sensor_data):
+        """Should raise ValueError for unsupported method."""
+        with pytest.raises(ValueError, match="Method 'invalid' not supported"):
+            detect_anomalies_all(multi_sensor_data, method="invalid")
+
+
+class TestTimeWindowBinning:
+    """Tests for time-window aggregation in summarize_metrics()."""
+    
+    @pytest.mark.parametrize("group_by", ["sensor", None])
+    @pytest.mark.parametrize("time_window", ["5min", "7min", "1h"])
+    def test_matches_resampling_grouper(self, gapped_data, group_by, time_window):
+        """Searchsorted binning should produce the same bins as pd.Grouper."""
+        from src.data_processing import _summarize_with_grouper
+        
+        result = summarize_metrics(gapped_data, group_by=group_by, time_window=time_window)
+        expected = _summarize_with_grouper(
+            gapped_data, group_by, time_window, has_anomaly_data=False
+        )
+        assert result == expected
+    
+    def test_empty_bins_reported_without_group_by(self, gapped_data):
+        """Should report empty bins between readings when not grouping by column."""
+        result = summarize_metrics(gapped_data, group_by=None, time_window="5min")
+        assert result["2025-01-01 06:10:00"]["count"] == 0
+        assert "2025-01-01 06:10:00" not in summarize_metrics(
+            gapped_data, group_by="sensor", time_window="5min"
+        )
+    
+    def test_calendar_frequency_falls_back_to_grouper(self, gapped_data):
+        """Should still support non-fixed frequencies such as month starts."""
+        result = summarize_metrics(gapped_data, group_by="sensor", time_window="MS")
+        assert result["2025-01-01 00:00:00"]["temperature"]["count"] == 7
+
+
 class TestDataIntegrity:
     """Tests for data integrity and consistency."""
     
@@ -334,7 +555,119 @@ class TestDataIntegrity:
         result = ingest_data([df])
         assert len(result) == 5
         assert all(result["sensor"] == "temperature")
+
+    def test_ingest_single_batch_does_not_modify_input(self):
+        """Should leave a single input batch untouched and return a fresh index."""
+        df = pd.DataFrame({
+            "timestamp": [datetime(2025, 1, 1) + timedelta(seconds=i) for i in (2, 0, 1)],
+            "sensor": ["temperature"] * 3,
+            "value": [67.0, 65.0, 66.0],
+            "unit": ["°C"] * 3,
+            "quality": ["GOOD"] * 3,
+        }, index=[10, 20, 30])
+        snapshot = df.copy()
+        result = ingest_data([df])
+        
+        pd.testing.assert_frame_equal(df, snapshot)
+        assert result.index.tolist() == [0, 1, 2]
+        assert result["value"].tolist() == [65.0, 66.0, 67.0]
+
+    @pytest.mark.parametrize("validate", [True, False])
+    def test_ingest_in_order_single_batch_gets_fresh_index(self, validate):
+        """Should renumber an already chronological batch without reordering it."""
+        df = pd.DataFrame({
+            "timestamp": pd.date_range("2025-01-01", periods=3, freq="s"),
+            "sensor": ["temperature"] * 3,
+            "value": [65.0, 66.0, 67.0],
+            "unit": ["°C"] * 3,
+            "quality": ["GOOD"] * 3,
+        }, index=[10, 20, 30])
+        result = ingest_data([df], validate=validate)
+
+        assert isinstance(result.index, pd.RangeIndex)
+        assert result.index.tolist() == [0, 1, 2]
+        assert result["value"].tolist() == [65.0, 66.0, 67.0]
+        assert df.index.tolist() == [10, 20, 30]
+
+    def test_ingest_uses_categorical_string_columns(self):
+        """Should store sensor, unit and quality as categoricals."""
+        df = pd.DataFrame({
+            "timestamp": [datetime.now() + timedelta(seconds=i) for i in range(4)],
+            "sensor": ["temperature", "pressure"] * 2,
+            "value": [65.0, 101.0, 66.0, 102.0],
+            "unit": ["°C", "kPa"] * 2,
+            "quality": ["GOOD", "GOOD", "BAD", "GOOD"],
+        })
+        result = ingest_data([df])
+        for col in ("sensor", "unit", "quality"):
+            assert isinstance(result[col].dtype, pd.CategoricalDtype)
+        assert set(result["sensor"].cat.categories) == {"temperature", "pressure"}
+
+    def test_ingest_mixes_categorical_and_string_batches(self):
+        """Should merge categorical and plain string batches into one categorical column."""
+        timestamps = pd.date_range("2024-01-01", periods=3, freq="s")
+        categorical_batch = pd.DataFrame({
+            "timestamp": timestamps,
+            "sensor": pd.Categorical(["temperature"] * 3),
+            "value": [65.0, 66.0, 67.0],
+            "unit": pd.Categorical(["°C"] * 3),
+            "quality": pd.Categorical(["GOOD"] * 3),
+        })
+        string_batch = pd.DataFrame({
+            "timestamp": timestamps,
+            "sensor": ["pressure"] * 3,
+            "value": [101.0, 102.0, 103.0],
+            "unit": ["kPa"] * 3,
+            "quality": ["BAD"] * 3,
+        })
+        result = ingest_data([categorical_batch, string_batch])
+
+        for col in ("sensor", "unit", "quality"):
+            assert isinstance(result[col].dtype, pd.CategoricalDtype)
+        assert set(result["sensor"].cat.categories) == {"temperature", "pressure"}
+        assert (result["sensor"] == "pressure").sum() == 3
+        metrics = summarize_metrics(result, group_by="sensor")
+        assert metrics["pressure"]["bad_quality_pct"] == 100.0
+        assert metrics["temperature"]["count"] == 3
+
+    def test_ingest_stores_values_as_float32(self):
+        """Should store readings as float32, preserving NaN."""
+        df = pd.DataFrame({
+            "timestamp": [datetime.now() + timedelta(seconds=i) for i in range(3)],
+            "sensor": ["pressure"] * 3,
+            "value": [101.3, np.nan, 101.5],
+            "unit": ["kPa"] * 3,
+            "quality": ["GOOD", "BAD", "GOOD"],
+        })
+        result = ingest_data([df])
+        assert result["value"].dtype == np.float32
+        assert result["value"].isna().sum() == 1
+        assert summarize_metrics(result)["pressure"]["mean"] == pytest.approx(101.4, rel=1e-6)
     
+    def test_ingest_keeps_first_of_conflicting_duplicates(self):
+        """Should keep the first reading when timestamp + sensor collide across batches."""
+        ts = datetime(2025, 1, 1, 0, 0, 0)
+        batch1 = pd.DataFrame({
+            "timestamp": [ts + timedelta(seconds=1), ts],
+            "sensor": ["temperature", "temperature"],
+            "value": [66.0, 65.0],
+            "unit": ["°C", "°C"],
+            "quality": ["GOOD", "GOOD"],
+        })
+        batch2 = pd.DataFrame({
+            "timestamp": [ts, ts],
+            "sensor": ["temperature", "pressure"],
+            "value": [99.0, 101.0],
+            "unit": ["°C", "kPa"],
+            "quality": ["UNCERTAIN", "GOOD"],
+        })
+        result = ingest_data([batch1, batch2])
+
+        assert len(result) == 3
+        temp_at_ts = result[(result["sensor"] == "temperature") & (result["timestamp"] == ts)]
+        assert temp_at_ts["value"].tolist() == [65.0]
+        assert result["timestamp"].is_monotonic_increasing
+
     def test_anomaly_detection_preserves_data_length(self):
         """Should return same number of rows as input."""
         df = pd.DataFrame({
@@ -349,6 +682,70 @@ class TestDataIntegrity:
         
         assert len(result) == len(clean_data)
     
+    def test_anomaly_detection_does_not_modify_input(self):
+        """Should leave the input DataFrame untouched."""
+        df = pd.DataFrame({
+            "timestamp": [datetime.now() + timedelta(seconds=i) for i in range(10)],
+            "sensor": ["temperature"] * 10,
+            "value": [65.0, 66.0, 64.5, 65.5, 66.5, 65.0, 80.0, 66.0, 65.5, 64.0],
+            "unit": ["°C"] * 10,
+            "quality": ["GOOD"] * 10,
+        })
+        clean_data = ingest_data([df])
+        snapshot = clean_data.copy()
+        for method in ("zscore", "iqr", "rolling"):
+            detect_anomalies(clean_data, "temperature", method=method)
+
+        pd.testing.assert_frame_equal(clean_data, snapshot)
+
+    @pytest.mark.parametrize("force_deep_copy", [False, True])
+    def test_writes_to_anomaly_result_do_not_reach_input(self, monkeypatch, force_deep_copy):
+        """Writing to the result should never modify the input, with or without copy-on-write."""
+        if force_deep_copy:
+            # Exercise the fallback used when pandas copy-on-write is not active
+            import src.data_processing as data_processing
+            monkeypatch.setattr(data_processing, "_copy_on_write_enabled", lambda: False)
+        df = pd.DataFrame({
+            "timestamp": pd.date_range("2025-01-01", periods=5, freq="s"),
+            "sensor": ["temperature"] * 5,
+            "value": [65.0, 66.0, 64.5, 65.5, 80.0],
+            "unit": ["°C"] * 5,
+            "quality": ["GOOD"] * 5,
+        })
+        clean_data = ingest_data([df])
+        snapshot = clean_data.copy()
+
+        result = detect_anomalies(clean_data, "temperature")
+        result.loc[0, "value"] = 999.0
+
+        pd.testing.assert_frame_equal(clean_data, snapshot)
+        if force_deep_copy:
+            # Without copy-on-write, the result must not share column data
+            assert not np.shares_memory(
+                result["timestamp"].to_numpy(), clean_data["timestamp"].to_numpy()
+            )
+
+    @pytest.mark.parametrize("method", ["zscore", "iqr", "rolling"])
+    def test_anomaly_columns_use_compact_dtypes(self, method):
+        """Should return bool flags, float32 scores and categorical method labels."""
+        values = [65.0, 66.0, 64.5, 65.5, 66.5, 65.0, 150.0, 66.0, 65.5, 64.0, 66.0, 65.0]
+        df = pd.DataFrame({
+            "timestamp": [datetime.now() + timedelta(seconds=i) for i in range(14)],
+            "sensor": ["temperature"] * 12 + ["pressure"] * 2,
+            "value": values + [101.0, 102.0],
+            "unit": ["°C"] * 12 + ["kPa"] * 2,
+            "quality": ["GOOD"] * 14,
+        })
+        clean_data = ingest_data([df])
+        result = detect_anomalies(clean_data, "temperature", method=method, threshold=1.5)
+        
+        assert result["is_anomaly"].dtype == bool
+        assert result["anomaly_score"].dtype == np.float32
+        assert isinstance(result["detection_method"].dtype, pd.CategoricalDtype)
+        assert (result.loc[result["sensor"] == "temperature", "detection_method"] == method).all()
+        assert (result.loc[result["sensor"] == "pressure", "detection_method"] == "").all()
+        assert result.loc[result["value"] == 150.0, "is_anomaly"].all()
+    
     def test_metrics_accuracy(self):
         """Should compute accurate statistics."""
         df = pd.DataFrame({
@@ -371,5 +768,103 @@ class TestDataIntegrity:
         assert temp_metrics["good_quality_pct"] == 100.0
 
 
+class TestSimulator:
+    """Tests for the IndustrialDataSimulator behaviour the pipeline relies on."""
+    
+    def test_seeded_instances_are_independent(self):
+        """Same-seed simulators should reproduce each other without touching global RNG state."""
+        global_state = np.random.get_state()[1].copy()
+        
+        first = IndustrialDataSimulator(seed=7, dropout_rate=0.0)
+        second = IndustrialDataSimulator(seed=7, dropout_rate=0.0)
+        second.start_time = first.start_time
+        
+        # Interleaved reads must not disturb each other's random streams
+        first_reads = [first.read_sensors(10, fast=True)]
+        second_reads = [second.read_sensors(10, fast=True)]
+        first_reads.append(first.read_sensors(10, fast=True))
+        second_reads.append(second.read_sensors(10, fast=True))
+        
+        for a, b in zip(first_reads, second_reads):
+            pd.testing.assert_frame_equal(a, b)
+        assert np.array_equal(np.random.get_state()[1], global_state)
+    
+    def test_deterministic_mode_emits_baselines(self, monkeypatch):
+        """Deterministic mode should emit clean baseline readings without sleeping."""
+        import src.data_simulator as data_simulator
+        
+        sleeps = []
+        monkeypatch.setattr(data_simulator.time, "sleep", sleeps.append)
+        simulator = IndustrialDataSimulator(dropout_rate=0.5, deterministic=True)
+        data = simulator.read_sensors(duration_seconds=20, interval_seconds=0.5)
+        
+        assert len(data) == 40 * len(simulator.sensors)
+        assert (data["quality"] == "GOOD").all()
+        assert data["timestamp"].is_monotonic_increasing
+        assert data["timestamp"].diff().max() == pd.Timedelta(seconds=0.5)
+        baseline_by_sensor = {name: c["baseline"] for name, c in simulator.sensors.items()}
+        baselines = data["sensor"].map(baseline_by_sensor)
+        assert (data["value"] == baselines.astype(float)).all()
+        assert sleeps == []
+    
+    def test_batch_latency_slept_once(self, monkeypatch):
+        """get_batch_readings should sleep once per call, not once per batch."""
+        import src.data_simulator as data_simulator
+        
+        sleeps = []
+        monkeypatch.delenv("SIM_NO_LATENCY", raising=False)
+        monkeypatch.setattr(data_simulator.time, "sleep", sleeps.append)
+        
+        simulator = IndustrialDataSimulator(seed=42, dropout_rate=0.0)
+        batches = simulator.get_batch_readings(num_batches=4)
+        
+        assert len(batches) == 4
+        assert len(sleeps) == 1
+        assert 0.01 <= sleeps[0] <= 0.05
+    
+    def test_readings_use_categorical_string_columns(self):
+        """Sensor, unit and quality should be emitted as categoricals with fixed categories."""
+        simulator = IndustrialDataSimulator(seed=42, dropout_rate=0.0)
+        data = simulator.read_sensors(duration_seconds=30, fast=True)
+        
+        assert list(data["sensor"].cat.categories) == list(simulator.sensors)
+        assert list(data["quality"].cat.categories) == ["GOOD", "UNCERTAIN", "BAD"]
+        assert isinstance(data["unit"].dtype, pd.CategoricalDtype)
+        units = data["sensor"].map({name: c["unit"] for name, c in simulator.sensors.items()})
+        assert (data["unit"].astype(str) == units.astype(str)).all()
+    
+    def test_batch_readings_skip_empty_batches(self, monkeypatch):
+        """Batches too short to contain a reading should not be returned."""
+        monkeypatch.setenv("SIM_NO_LATENCY", "1")
+        simulator = IndustrialDataSimulator(seed=42, dropout_rate=0.0)
+        
+        assert simulator.get_batch_readings(num_batches=3, batch_duration=0) == []
+    
+    @pytest.mark.parametrize("dropout_rate, expected_batches", [(0.0, 3), (1.0, 0)])
+    def test_async_batch_readings(self, dropout_rate, expected_batches):
+        """get_batch_readings_async should gather reads and drop failed ones."""
+        import asyncio
+        
+        simulator = IndustrialDataSimulator(seed=42, dropout_rate=dropout_rate)
+        batches = asyncio.run(simulator.get_batch_readings_async(num_batches=3, batch_duration=10))
+        
+        assert len(batches) == expected_batches
+        assert all(len(batch) >= 40 for batch in batches)
+    
+    def test_no_latency_env_var_skips_sleep(self, monkeypatch):
+        """SIM_NO_LATENCY should disable the simulated latency entirely."""
+        import src.data_simulator as data_simulator
+        
+        sleeps = []
+        monkeypatch.setenv("SIM_NO_LATENCY", "1")
+        monkeypatch.setattr(data_simulator.time, "sleep", sleeps.append)
+        
+        simulator = IndustrialDataSimulator(seed=42, dropout_rate=0.0)
+        simulator.read_sensors(duration_seconds=5)
+        simulator.get_batch_readings(num_batches=2, batch_duration=5)
+        
+        assert sleeps == []
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
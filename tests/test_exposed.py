@@ -15,34 +15,36 @@ Run with: pytest tests/test_exposed.py -v
 import pytest
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-import sys
-from pathlib import Path
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+from datetime import datetime
 
 from src.data_simulator import IndustrialDataSimulator
 from src.data_processing import ingest_data, detect_anomalies, summarize_metrics
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def simple_data():
-    """Create simple, clean test data."""
-    timestamps = [datetime.now() + timedelta(seconds=i) for i in range(10)]
+    """Create simple, clean test data (shared read-only across the module)."""
+    timestamps = pd.date_range(datetime.now(), periods=10, freq="s")
+    steps = np.arange(10)
     data = {
-        "timestamp": timestamps * 2,
-        "sensor": ["temperature"] * 10 + ["pressure"] * 10,
-        "value": [65.0 + i * 0.5 for i in range(10)] + [101.0 + i * 0.2 for i in range(10)],
-        "unit": ["°C"] * 10 + ["kPa"] * 10,
-        "quality": ["GOOD"] * 20,
+        "timestamp": np.tile(timestamps.to_numpy(), 2),
+        "sensor": np.repeat(["temperature", "pressure"], 10),
+        "value": np.concatenate([65.0 + steps * 0.5, 101.0 + steps * 0.2]),
+        "unit": np.repeat(["°C", "kPa"], 10),
+        "quality": np.repeat("GOOD", 20),
     }
-    return pd.DataFrame(data)
+    return pd.DataFrame(data, copy=False)
+
+
+@pytest.fixture(scope="module")
+def clean_simple_data(simple_data):
+    """Ingest simple_data once for the tests that only need clean input."""
+    return ingest_data([simple_data])
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def simulator():
-    """Create deterministic simulator for testing."""
+    """Create deterministic simulator for testing (seeded, shared across the module)."""
     return IndustrialDataSimulator(seed=42, dropout_rate=0.0)
 
 
@@ -73,12 +75,12 @@ class TestIngestData:
     def test_removes_duplicates(self):
         """Should remove duplicate readings."""
         df = pd.DataFrame({
-            "timestamp": [datetime.now()] * 3,
-            "sensor": ["temperature"] * 3,
-            "value": [65.0] * 3,
-            "unit": ["°C"] * 3,
-            "quality": ["GOOD"] * 3,
-        })
+            "timestamp": np.repeat(np.datetime64(datetime.now(), "us"), 3),
+            "sensor": np.repeat("temperature", 3),
+            "value": np.repeat(65.0, 3),
+            "unit": np.repeat("°C", 3),
+            "quality": np.repeat("GOOD", 3),
+        }, copy=False)
         result = ingest_data([df], validate=True)
         # Should have fewer rows after deduplication
         assert len(result) < len(df) or len(result) == 1
@@ -89,18 +91,19 @@ class TestIngestData:
         shuffled = simple_data.sample(frac=1).reset_index(drop=True)
         result = ingest_data([shuffled], validate=True)
         
-        timestamps = result["timestamp"].tolist()
-        assert timestamps == sorted(timestamps)
+        # Monotonic check on the int64 view instead of a Python sort of Timestamps
+        ts = result["timestamp"].to_numpy().view("i8")
+        assert np.all(np.diff(ts) >= 0)
     
     def test_handles_missing_values(self):
         """Should handle NaN values appropriately."""
         df = pd.DataFrame({
-            "timestamp": [datetime.now() + timedelta(seconds=i) for i in range(5)],
-            "sensor": ["temperature"] * 5,
-            "value": [65.0, np.nan, 66.0, np.nan, 67.0],
-            "unit": ["°C"] * 5,
-            "quality": ["GOOD", "BAD", "GOOD", "BAD", "GOOD"],
-        })
+            "timestamp": pd.date_range(datetime.now(), periods=5, freq="s"),
+            "sensor": np.repeat("temperature", 5),
+            "value": np.array([65.0, np.nan, 66.0, np.nan, 67.0]),
+            "unit": np.repeat("°C", 5),
+            "quality": np.array(["GOOD", "BAD", "GOOD", "BAD", "GOOD"]),
+        }, copy=False)
         result = ingest_data([df], validate=True)
         # Should complete without error
         assert isinstance(result, pd.DataFrame)
@@ -109,45 +112,32 @@ class TestIngestData:
 class TestDetectAnomalies:
     """Tests for the detect_anomalies() function."""
     
-    def test_detect_with_zscore_method(self, simple_data):
+    def test_detect_with_zscore_method(self, clean_simple_data):
         """Should detect anomalies using z-score method."""
-        clean_data = ingest_data([simple_data])
-        result = detect_anomalies(clean_data, "temperature", method="zscore", threshold=3.0)
+        result = detect_anomalies(clean_simple_data, "temperature", method="zscore", threshold=3.0)
         
         assert "is_anomaly" in result.columns
         assert "anomaly_score" in result.columns
         assert result["is_anomaly"].dtype == bool
     
-    def test_returns_same_number_of_rows(self, simple_data):
+    def test_returns_same_number_of_rows(self, clean_simple_data):
         """Should return same number of rows as input."""
-        clean_data = ingest_data([simple_data])
-        sensor_data = clean_data[clean_data["sensor"] == "temperature"]
-        result = detect_anomalies(clean_data, "temperature", method="zscore")
+        sensor_data = clean_simple_data[clean_simple_data["sensor"] == "temperature"]
+        result = detect_anomalies(clean_simple_data, "temperature", method="zscore")
         
         result_sensor = result[result["sensor"] == "temperature"]
         assert len(result_sensor) == len(sensor_data)
     
-    def test_invalid_sensor_raises_error(self, simple_data):
-        """Should raise ValueError for non-existent sensor."""
-        clean_data = ingest_data([simple_data])
-        with pytest.raises(ValueError):
-            detect_anomalies(clean_data, "nonexistent_sensor")
-    
-    def test_invalid_method_raises_error(self, simple_data):
-        """Should raise ValueError for unsupported method."""
-        clean_data = ingest_data([simple_data])
-        with pytest.raises(ValueError):
-            detect_anomalies(clean_data, "temperature", method="invalid_method")
-    
     def test_detects_obvious_anomaly(self):
         """Should detect an obvious outlier."""
         df = pd.DataFrame({
-            "timestamp": [datetime.now() + timedelta(seconds=i) for i in range(11)],
-            "sensor": ["temperature"] * 11,
-            "value": [65.0] * 5 + [1000.0] + [65.0] * 5,  # Obvious outlier
-            "unit": ["°C"] * 11,
-            "quality": ["GOOD"] * 11,
-        })
+            "timestamp": pd.date_range(datetime.now(), periods=11, freq="s"),
+            "sensor": np.repeat("temperature", 11),
+            # Obvious outlier in the middle
+            "value": np.concatenate([np.repeat(65.0, 5), [1000.0], np.repeat(65.0, 5)]),
+            "unit": np.repeat("°C", 11),
+            "quality": np.repeat("GOOD", 11),
+        }, copy=False)
         clean_data = ingest_data([df])
         result = detect_anomalies(clean_data, "temperature", method="zscore", threshold=2.0)
         
@@ -158,19 +148,17 @@ class TestDetectAnomalies:
 class TestSummarizeMetrics:
     """Tests for the summarize_metrics() function."""
     
-    def test_returns_dict_structure(self, simple_data):
+    def test_returns_dict_structure(self, clean_simple_data):
         """Should return nested dictionary structure."""
-        clean_data = ingest_data([simple_data])
-        result = summarize_metrics(clean_data, group_by="sensor")
+        result = summarize_metrics(clean_simple_data, group_by="sensor")
         
         assert isinstance(result, dict)
         assert "temperature" in result
         assert "pressure" in result
     
-    def test_contains_required_metrics(self, simple_data):
+    def test_contains_required_metrics(self, clean_simple_data):
         """Should include essential statistical metrics."""
-        clean_data = ingest_data([simple_data])
-        result = summarize_metrics(clean_data, group_by="sensor")
+        result = summarize_metrics(clean_simple_data, group_by="sensor")
         
         temp_metrics = result["temperature"]
         assert "mean" in temp_metrics
@@ -179,10 +167,9 @@ class TestSummarizeMetrics:
         assert "max" in temp_metrics
         assert "count" in temp_metrics
     
-    def test_calculates_correct_count(self, simple_data):
+    def test_calculates_correct_count(self, clean_simple_data):
         """Should count readings correctly."""
-        clean_data = ingest_data([simple_data])
-        result = summarize_metrics(clean_data, group_by="sensor")
+        result = summarize_metrics(clean_simple_data, group_by="sensor")
         
         # We know simple_data has 10 readings per sensor
         assert result["temperature"]["count"] >= 1
@@ -193,12 +180,24 @@ class TestSummarizeMetrics:
         empty_df = pd.DataFrame(columns=["timestamp", "sensor", "value", "unit", "quality"])
         with pytest.raises(ValueError):
             summarize_metrics(empty_df)
-    
-    def test_invalid_group_by_raises_error(self, simple_data):
-        """Should raise ValueError for invalid group_by column."""
-        clean_data = ingest_data([simple_data])
+
+
+class TestInvalidInputs:
+    """Invalid arguments on clean data, sharing one ingested fixture."""
+    
+    @pytest.mark.parametrize(
+        "func,args,kwargs",
+        [
+            (detect_anomalies, ("nonexistent_sensor",), {}),
+            (detect_anomalies, ("temperature",), {"method": "invalid_method"}),
+            (summarize_metrics, (), {"group_by": "nonexistent_column"}),
+        ],
+        ids=["invalid_sensor", "invalid_method", "invalid_group_by"],
+    )
+    def test_invalid_input_raises_error(self, clean_simple_data, func, args, kwargs):
+        """Should raise ValueError for a non-existent sensor, method or group_by column."""
         with pytest.raises(ValueError):
-            summarize_metrics(clean_data, group_by="nonexistent_column")
+            func(clean_simple_data, *args, **kwargs)
 
 
 class TestEndToEndWorkflow:
@@ -8,9 +8,10 @@ Run this after initial setup or before candidate deployment.
 Usage: python verify_setup.py
 """
 
+import importlib.util
+import os
 import sys
 from pathlib import Path
-import subprocess
 
 
 def print_section(title):
@@ -20,9 +21,21 @@ def print_section(title):
     print("=" * 60)
 
 
-def check_file_exists(filepath, description, required=True):
-    """Check if a file exists."""
-    exists = Path(filepath).exists()
+def list_present_files(filepaths):
+    """List which of the given files exist, scanning each parent directory once."""
+    present = set()
+    for directory in {Path(filepath).parent for filepath in filepaths}:
+        if directory.is_dir():
+            with os.scandir(directory) as entries:
+                present.update(
+                    (directory / entry.name).as_posix() for entry in entries if entry.is_file()
+                )
+    return present
+
+
+def check_file_exists(filepath, description, required=True, present=None):
+    """Check if a file exists (in ``present`` when a listing is given)."""
+    exists = filepath in present if present is not None else Path(filepath).exists()
     status = "✓" if exists else ("✗" if required else "⚠")
     req_text = "(required)" if required else "(optional)"
     print(f"{status} {description}: {filepath} {req_text}")
@@ -30,7 +43,7 @@ def check_file_exists(filepath, description, required=True):
 
 
 def check_imports():
-    """Check if required packages can be imported."""
+    """Check if required packages are installed (without importing them)."""
     print_section("Checking Python Dependencies")
     
     packages = {
@@ -41,10 +54,9 @@ def check_imports():
     
     all_ok = True
     for name, import_name in packages.items():
-        try:
-            __import__(import_name)
+        if importlib.util.find_spec(import_name) is not None:
             print(f"✓ {name} is installed")
-        except ImportError:
+        else:
             print(f"✗ {name} is NOT installed")
             all_ok = False
     
@@ -78,13 +90,17 @@ def check_structure():
         ("docs/index.md", "Documentation"),
     ]
     
+    present = list_present_files(
+        filepath for filepath, _ in required_files + optional_files
+    )
+    
     all_ok = True
     for filepath, description in required_files:
-        if not check_file_exists(filepath, description, required=True):
+        if not check_file_exists(filepath, description, required=True, present=present):
             all_ok = False
     
     for filepath, description in optional_files:
-        check_file_exists(filepath, description, required=False)
+        check_file_exists(filepath, description, required=False, present=present)
     
     return all_ok
 
@@ -93,11 +109,12 @@ def check_hidden_tests():
     """Check hidden tests setup."""
     print_section("Checking Hidden Tests")
     
-    hidden_test_file = Path("tests_hidden/test_hidden.py")
-    readme_file = Path("tests_hidden/README.md")
+    hidden_test_file = "tests_hidden/test_hidden.py"
+    readme_file = "tests_hidden/README.md"
     
-    readme_exists = readme_file.exists()
-    test_exists = hidden_test_file.exists()
+    present = list_present_files([hidden_test_file, readme_file])
+    readme_exists = readme_file in present
+    test_exists = hidden_test_file in present
     
     if readme_exists:
         print("✓ tests_hidden/README.md exists")
@@ -196,7 +213,10 @@ def check_gitignore():
         print("✗ .gitignore does not exist")
         return False
     
-    content = gitignore_path.read_text()
+    # Compare whole lines: a substring check would let ".venv/" satisfy "venv/"
+    patterns = {
+        line.strip() for line in gitignore_path.read_text().splitlines() if line.strip()
+    }
     
     required_patterns = [
         ("venv/", "Virtual environments"),
@@ -207,7 +227,7 @@ def check_gitignore():
     
     all_ok = True
     for pattern, description in required_patterns:
-        if pattern in content:
+        if pattern in patterns:
             print(f"✓ Ignores {description}")
         else:
             print(f"⚠ Missing pattern for {description}: {pattern}")